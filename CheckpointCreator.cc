@@ -4,6 +4,18 @@
 #include <iomanip>
 #include <sstream>
 
+struct CheckpointEntry {
+  TFile* file;
+  const char* source;
+  const char* target;
+};
+
+void WriteCheckpointEntries(const vector<CheckpointEntry>& entries)
+{
+  for (const auto& entry : entries)
+    entry.file->Get(entry.source)->Clone(entry.target)->Write();
+}
+
 void CheckpointCreator()
 {
   TFile systematics(kSystematicsOutput.data());
@@ -12,6 +24,28 @@ void CheckpointCreator()
   TFile mcAR(kMCAnalysisResults.data());
   TFile signal(kSignalOutput.data());
 
+  const vector<CheckpointEntry> mainEntries{
+    {&systematics, "pubStat", "published_stat"},
+    {&systematics, "pubSyst", "published_syst"},
+    {&systematics, "fStatTPCA", "tpc_spectrum_stat"},
+    {&systematics, "fSystTPCA", "tpc_spectrum_syst"},
+    {&systematics, "fStatTOFA", "tof_spectrum_stat"},
+    {&systematics, "fSystTOFA", "tof_spectrum_syst"},
+    {&mc, "nuclei/effTPCA", "tpc_efficiency"},
+    {&mc, "nuclei/effTOFA", "tof_efficiency"}
+  };
+  const vector<CheckpointEntry> mcEntries{
+    {&mc, "nuclei/genAHe3", "generated"},
+    {&mc, "nuclei/TPCAHe3", "tpc_reconstructed"},
+    {&mc, "nuclei/TOFAHe3", "tof_reconstructed"},
+    {&mcAR, "nuclei-spectra/spectra/hRecVtxZData", "events_reconstructed"}
+  };
+  const vector<CheckpointEntry> dataEntries{
+    {&dataAR, "nuclei-spectra/spectra/hRecVtxZData", "events_reconstructed"},
+    {&signal, "nuclei/antihe3/TPConly/hTPConlyA0_ExpGaus", "tpc_rawcounts"},
+    {&signal, "nuclei/antihe3/GausExp/hRawCountsA0", "tof_rawcounts"}
+  };
+
   // Get the current time
   auto now = std::chrono::system_clock::now();
   std::time_t time = std::chrono::system_clock::to_time_t(now);
@@ -20,26 +54,14 @@ void CheckpointCreator()
   oss << "checkpoint-" << std::put_time(tm, "%d%m%y") << ".root";
   TFile checkpoint(oss.str().data(), "RECREATE");
   checkpoint.cd();
-  systematics.Get("pubStat")->Clone("published_stat")->Write();
-  systematics.Get("pubSyst")->Clone("published_syst")->Write();
-  systematics.Get("fStatTPCA")->Clone("tpc_spectrum_stat")->Write();
-  systematics.Get("fSystTPCA")->Clone("tpc_spectrum_syst")->Write();
-  systematics.Get("fStatTOFA")->Clone("tof_spectrum_stat")->Write();
-  systematics.Get("fSystTOFA")->Clone("tof_spectrum_syst")->Write();
-  mc.Get("nuclei/effTPCA")->Clone("tpc_efficiency")->Write();
-  mc.Get("nuclei/effTOFA")->Clone("tof_efficiency")->Write();
+  WriteCheckpointEntries(mainEntries);
   std::cout << "Main dir done" << std::endl;
   checkpoint.mkdir("MC");
   checkpoint.cd("MC");
-  mc.Get("nuclei/genAHe3")->Clone("generated")->Write();
-  mc.Get("nuclei/TPCAHe3")->Clone("tpc_reconstructed")->Write();
-  mc.Get("nuclei/TOFAHe3")->Clone("tpc_reconstructed")->Write();
-  mcAR.Get("nuclei-spectra/spectra/hRecVtxZData")->Clone("events_reconstructed")->Write();
+  WriteCheckpointEntries(mcEntries);
   std::cout << "MC dir done" << std::endl;
   checkpoint.mkdir("Data");
   checkpoint.cd("Data");
-  dataAR.Get("nuclei-spectra/spectra/hRecVtxZData")->Clone("events_reconstructed")->Write();
-  signal.Get("nuclei/antihe3/TPConly/hTPConlyA0_ExpGaus")->Clone("tpc_rawcounts")->Write();
-  signal.Get("nuclei/antihe3/GausExp/hRawCountsA0")->Clone("tof_rawcounts")->Write();
+  WriteCheckpointEntries(dataEntries);
   std::cout << "Data dir done" << std::endl;
-}
\ No newline at end of file
+}
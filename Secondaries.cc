@@ -48,7 +48,7 @@ void Signal()
 
   /// Taking all the histograms from the MC file
   TFile input_file(kDataFilename.data());
-  TFile output_file(kSignalOutput.data(), "recreate");
+  TFile output_file(kSignalOutput.data(), "recreate", "", kOutputCompression);
 
   /// Setting up the fitting environment for TOF analysis
   RooRealVar m("dm2", "m^{2} - m^p_{^{3}He}", -1.2, 1.5, "GeV/#it{c}^{2}");
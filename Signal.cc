@@ -27,6 +27,7 @@ using std::vector;
 #include <TStyle.h>
 #include <TError.h>
 
+#include <RooAbsReal.h>
 #include <RooArgList.h>
 #include <RooFitResult.h>
 #include <RooDataHist.h>
@@ -49,7 +50,7 @@ void Signal()
 
   /// Taking all the histograms from the MC file
   TFile input_file(gSystem->ExpandPathName(kDataFilename.data()));
-  TFile output_file(gSystem->ExpandPathName(kSignalOutput.data()), "recreate");
+  TFile output_file(gSystem->ExpandPathName(kSignalOutput.data()), "recreate", "", kOutputCompression);
 
   /// Setting up the fitting environment for TOF analysis
   RooRealVar m("dm2", "m - m_{^{3}He}", -1.2, 1.5, "GeV/#it{c}^{2}");
@@ -77,6 +78,11 @@ void Signal()
   fBkg.UseSignal(false);
   fBkg.mTau0->setUnit("GeV#it{c}^{2}");
   fBkg.mTau1->setUnit("GeV#it{c}^{2}");
+  /// Background yield in the current "signal" counting range, the integral is owned here so that it is not leaked
+  auto bkgInSignalRange = [&]() {
+    std::unique_ptr<RooAbsReal> integral{fBkg.mBackground->createIntegral(m_bis, NormSet(m_bis), Range("signal"))};
+    return integral->getVal() * fBkg.mBkgCounts->getVal();
+  };
 
   // Setting up the fitting environment for the TPC analysis
   RooRealVar ns("ns", "n#sigma_{^{3}He}", -5., 5, "a. u.");
@@ -247,11 +253,13 @@ void Signal()
         hRawCounts[iS][iC]->SetBinError(iB + 1, fExpExpTailGaus.mSigCounts->getError());
 
         /// Bin counting TOF
-        float residual_vector[n_sigma_vec.size()];
+        const double mu = fExpExpTailGaus.mMu->getVal();
+        const double sigma = fExpExpTailGaus.mSigma->getVal();
+        vector<float> residual_vector(n_sigma_vec.size());
         for (size_t iSigma = 0; iSigma < n_sigma_vec.size(); iSigma++)
         {
-          float left_sigma = fExpExpTailGaus.mMu->getVal() - n_sigma_vec[iSigma] * fExpExpTailGaus.mSigma->getVal();
-          float right_sigma = fExpExpTailGaus.mMu->getVal() + (float(n_sigma_vec[iSigma]) + 2.) * fExpExpTailGaus.mSigma->getVal();
+          float left_sigma = mu - n_sigma_vec[iSigma] * sigma;
+          float right_sigma = mu + (float(n_sigma_vec[iSigma]) + 2.) * sigma;
           int left_edge_bin = dat->FindBin(left_sigma);
           float left_edge_float = dat->GetBinLowEdge(left_edge_bin);
           int right_edge_bin = dat->FindBin(right_sigma);
@@ -265,7 +273,7 @@ void Signal()
             base_dir->cd(Form("%s/Sidebands/C_%d", kNames[iS].data(), iC));
             bkgPlot->Write();
           }
-          float bkg_integral = (iB > 8) ? fBkg.mBackground->createIntegral(m_bis, NormSet(m_bis), Range("signal"))->getVal() * fBkg.mBkgCounts->getVal() : 0;
+          float bkg_integral = (iB > 8) ? bkgInSignalRange() : 0;
           if (iB > 8)
           {
             hChiSquare[iS][iC]->SetBinContent(iB + 1, fBkg.mChi2);
@@ -282,27 +290,27 @@ void Signal()
           }
           residual_vector[iSigma] = sig_integral;
         }
-        width_range_syst = TMath::RMS(n_sigma_vec.size(), residual_vector);
+        width_range_syst = residual_vector.size() > 1 ? TMath::RMS(residual_vector.size(), residual_vector.data()) : 0.f;
         width_range_syst /= hRawCounts[iS][iC]->GetBinContent(iB + 1);
         hWidenRangeSyst[iS][iC]->SetBinContent(iB + 1, width_range_syst);
         // Moving the counting range
-        float shift_vector[n_shifts];
+        vector<float> shift_vector(n_shifts);
         for (int iShift = 0; iShift < n_shifts; iShift++)
         {
-          float left_sigma = fExpExpTailGaus.mMu->getVal() - 3. * fExpExpTailGaus.mSigma->getVal() - v_shift[iShift];
-          float right_sigma = fExpExpTailGaus.mMu->getVal() + 5. * fExpExpTailGaus.mSigma->getVal() - v_shift[iShift];
+          float left_sigma = mu - 3. * sigma - v_shift[iShift];
+          float right_sigma = mu + 5. * sigma - v_shift[iShift];
           int left_edge_bin = dat->FindBin(left_sigma);
           float left_edge_float = dat->GetBinLowEdge(left_edge_bin);
           int right_edge_bin = dat->FindBin(right_sigma);
           float right_edge_float = dat->GetBinLowEdge(right_edge_bin + 1);
           fBkg.mX->setRange("signal", left_edge_float, right_edge_float);
-          float bkg_integral = (iB > 7) ? fBkg.mBackground->createIntegral(m_bis, NormSet(m_bis), Range("signal"))->getVal() * fBkg.mBkgCounts->getVal() : 0;
+          float bkg_integral = (iB > 7) ? bkgInSignalRange() : 0;
           float tot_integral = dat->Integral(left_edge_bin, right_edge_bin);
           float sig_integral = tot_integral - bkg_integral;
           float sig_err = TMath::Sqrt(tot_integral + bkg_integral);
           shift_vector[iShift] = sig_integral;
         }
-        pos_range_syst = TMath::RMS(n_shifts, shift_vector);
+        pos_range_syst = shift_vector.size() > 1 ? TMath::RMS(shift_vector.size(), shift_vector.data()) : 0.f;
         pos_range_syst /= hRawCounts[iS][iC]->GetBinContent(iB + 1);
         hShiftRangeSyst[iS][iC]->SetBinContent(iB + 1, pos_range_syst);
 
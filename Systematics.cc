@@ -27,6 +27,9 @@ void Systematics() {
     systTPC[iC] = new TH2D(Form("systTPC%s", kNames[iC].data()), ";#it{p}_{T} (GeV/#it{c});Relative systematics TPC", kNPtBins, kPtBins, 50, -0.5, 0.5);
     systTOF[iC] = new TH2D(Form("systTOF%s", kNames[iC].data()), ";#it{p}_{T} (GeV/#it{c});Relative systematics TOF", kNPtBins, kPtBins, 50, -0.5, 0.5);
   }
+  /// Unbinned moments of the relative variations, the TH2s above are kept for QA only
+  double sumTPC[2][kNPtBins]{}, sum2TPC[2][kNPtBins]{}, nTPC[2][kNPtBins]{};
+  double sumTOF[2][kNPtBins]{}, sum2TOF[2][kNPtBins]{}, nTOF[2][kNPtBins]{};
   TH1* defaultEffTPC[2]{nullptr};
   TH1* defaultEffTOF[2]{nullptr};
   TH1* defaultTPC[2]{nullptr};
@@ -98,28 +101,47 @@ void Systematics() {
         float defaultValueTOF = defaultTOF[iS]->GetBinContent(iB);
         for (int iTPC{0}; iTPC < 3; ++iTPC) {
           float value = hDataTPC[iS][iTPC]->GetBinContent(iB);
-          systTPC[iS]->Fill(pt, (value - defaultValueTPC) / defaultValueTPC);
+          double rel = (value - defaultValueTPC) / defaultValueTPC;
+          if (!std::isfinite(rel))
+            continue;
+          systTPC[iS]->Fill(pt, rel);
+          sumTPC[iS][iB - 1] += rel;
+          sum2TPC[iS][iB - 1] += rel * rel;
+          nTPC[iS][iB - 1] += 1.;
         }
         for (int iTOF{0}; iTOF < 2; ++iTOF) {
           float value = hDataTOF[iS][iTOF][0]->GetBinContent(iB);
-          systTOF[iS]->Fill(pt, (value - defaultValueTOF) / defaultValueTOF);
+          double rel = (value - defaultValueTOF) / defaultValueTOF;
+          if (!std::isfinite(rel))
+            continue;
+          systTOF[iS]->Fill(pt, rel);
+          sumTOF[iS][iB - 1] += rel;
+          sum2TOF[iS][iB - 1] += rel * rel;
+          nTOF[iS][iB - 1] += 1.;
         }
       }
     }
   }
 
+  /// Same convention as TH1::GetRMS, i.e. the population standard deviation
+  auto stdDev = [](double sum, double sum2, double n) {
+    if (n <= 0.)
+      return 0.;
+    double mean = sum / n;
+    return std::sqrt(std::max(sum2 / n - mean * mean, 0.));
+  };
   TH1D* hSystTPC[2];
   TH1D* hSystTOF[2];
   for (int iS{0}; iS < 2; ++iS) {
     hSystTPC[iS] = new TH1D(Form("hSystTPC%c",kLetter[iS]), ";#it{p}_{T} (GeV/#it{c});Relative systematics TPC", kNPtBins, kPtBins);
     hSystTOF[iS] = new TH1D(Form("hSystTOF%c",kLetter[iS]), ";#it{p}_{T} (GeV/#it{c});Relative systematics TOF", kNPtBins, kPtBins);
     for (int iB{1}; iB <= kNPtBins; ++iB) {
-      hSystTPC[iS]->SetBinContent(iB, systTPC[iS]->ProjectionY("", iB, iB)->GetRMS());
-      hSystTOF[iS]->SetBinContent(iB, systTOF[iS]->ProjectionY("", iB, iB)->GetRMS());
+      hSystTPC[iS]->SetBinContent(iB, stdDev(sumTPC[iS][iB - 1], sum2TPC[iS][iB - 1], nTPC[iS][iB - 1]));
+      hSystTOF[iS]->SetBinContent(iB, stdDev(sumTOF[iS][iB - 1], sum2TOF[iS][iB - 1], nTOF[iS][iB - 1]));
     }
   }
 
-  TFile syst(kSystematicsOutput.data(), "recreate");
+  TFile syst(kSystematicsOutput.data(), "recreate", "", kOutputCompression);
 
   TH1* tofMatchingM = (TH1*)defaultTOFuncorr[0]->Clone(Form("TOFmatching%s", kNames[0].data()));
   TH1* tofMatchingA = (TH1*)defaultTOFuncorr[1]->Clone(Form("TOFmatching%s", kNames[1].data()));
@@ -17,46 +17,63 @@ void analyseData(std::string inputFileName = kDataTreeFilename, std::string outp
   auto dfPrimary = dfBase.Filter(kDefaultRecSelections.data());
   auto dfSecondary = dfBase.Filter("fTPCnCls > 120 && nITScls >= 6 && std::abs(nsigmaDCAz) > 7 && std::abs(fDCAxy) < 0.2");
 
+  /// Lazy, so that the skim is written in the same event loop that fills the histograms
+  ROOT::RDF::RResultPtr<ROOT::RDF::RInterface<ROOT::Detail::RDF::RLoopManager>> skimSnapshot;
   if (skim)
   {
-    dfBase.Filter("std::abs(nsigmaDCAz) < 8 && std::abs(fDCAxy) < 0.2 && std::abs(nsigmaHe3) < 5").Snapshot("nucleiTree", "data/skimmed.root");
+    ROOT::RDF::RSnapshotOptions skimOptions;
+    skimOptions.fCompressionAlgorithm = ROOT::RCompressionSetting::EAlgorithm::kLZ4;
+    skimOptions.fCompressionLevel = 4;
+    skimOptions.fLazy = true;
+    skimSnapshot = dfBase.Filter("std::abs(nsigmaDCAz) < 8 && std::abs(fDCAxy) < 0.2 && std::abs(nsigmaHe3) < 5").Snapshot("nucleiTree", "data/skimmed.root", d.GetColumnNames(), skimOptions);
   }
 
   std::vector<ROOT::RDF::RResultPtr<TH2D>> hDCAxyAHe3, hDCAxyMHe3, hDCAxySecondaryMHe3, hDCAxySecondaryAHe3, hDCAzAHe3, hDCAzMHe3, hTPCAHe3, hTPCMHe3, hTOFAHe3, hTOFMHe3;
 
-  hDCAxyAHe3.push_back(dfPrimary.Filter("!matter && nsigmaHe3 > -0.5 && nsigmaHe3 < 3 && hasGoodTOFmassHe3").Histo2D({"hDCAxyAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "pt", "fDCAxy"));
-  hDCAxyMHe3.push_back(dfPrimary.Filter("matter && nsigmaHe3 > -0.5 && nsigmaHe3 < 3 && hasGoodTOFmassHe3").Histo2D({"hDCAxyMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "pt", "fDCAxy"));
-  hDCAzAHe3.push_back(dfPrimary.Filter("!matter && nsigmaHe3 > -0.5 && nsigmaHe3 < 3 && hasGoodTOFmassHe3").Histo2D({"hDCAzAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{z} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "pt", "fDCAz"));
-  hDCAzMHe3.push_back(dfPrimary.Filter("matter && nsigmaHe3 > -0.5 && nsigmaHe3 < 3 && hasGoodTOFmassHe3").Histo2D({"hDCAzMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{z} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "pt", "fDCAz"));
-  hDCAxySecondaryMHe3.push_back(dfSecondary.Filter("matter && nsigmaHe3 > -0.5 && nsigmaHe3 < 3 && hasGoodTOFmassHe3").Histo2D({"hDCAxySecondaryMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "pt", "fDCAxy"));
-  hDCAxySecondaryAHe3.push_back(dfSecondary.Filter("!matter && nsigmaHe3 > -0.5 && nsigmaHe3 < 3 && hasGoodTOFmassHe3").Histo2D({"hDCAxySecondaryAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "pt", "fDCAxy"));
+  hDCAxyAHe3.push_back(dfPrimary.Filter(DCASelection{false}, {"matter", "nsigmaHe3", "hasGoodTOFmassHe3"}).Histo2D({"hDCAxyAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "pt", "fDCAxy"));
+  hDCAxyMHe3.push_back(dfPrimary.Filter(DCASelection{true}, {"matter", "nsigmaHe3", "hasGoodTOFmassHe3"}).Histo2D({"hDCAxyMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "pt", "fDCAxy"));
+  hDCAzAHe3.push_back(dfPrimary.Filter(DCASelection{false}, {"matter", "nsigmaHe3", "hasGoodTOFmassHe3"}).Histo2D({"hDCAzAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{z} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "pt", "fDCAz"));
+  hDCAzMHe3.push_back(dfPrimary.Filter(DCASelection{true}, {"matter", "nsigmaHe3", "hasGoodTOFmassHe3"}).Histo2D({"hDCAzMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{z} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "pt", "fDCAz"));
+  hDCAxySecondaryMHe3.push_back(dfSecondary.Filter(DCASelection{true}, {"matter", "nsigmaHe3", "hasGoodTOFmassHe3"}).Histo2D({"hDCAxySecondaryMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "pt", "fDCAxy"));
+  hDCAxySecondaryAHe3.push_back(dfSecondary.Filter(DCASelection{false}, {"matter", "nsigmaHe3", "hasGoodTOFmassHe3"}).Histo2D({"hDCAxySecondaryAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "pt", "fDCAxy"));
 
-  hTPCAHe3.push_back(dfPrimary.Filter("!matter && hasGoodTOFmassHe3").Histo2D({"fATPCcounts", ";#it{p}_{T}^{rec} (GeV/#it{c});^{3}#bar{He} n#sigma_{TPC};Counts", kNPtBins, kPtBins, 100, -5, 5}, "pt", "nsigmaHe3"));
-  hTPCMHe3.push_back(dfPrimary.Filter("matter && hasGoodTOFmassHe3").Histo2D({"fMTPCcounts", ";#it{p}_{T}^{rec} (GeV/#it{c});^{3}He n#sigma_{TPC};Counts", kNPtBins, kPtBins, 100, -5, 5}, "pt", "nsigmaHe3"));
+  hTPCAHe3.push_back(dfPrimary.Filter(TPCSelection{false}, {"matter", "fDCAxy", "hasGoodTOFmassHe3"}).Histo2D({"fATPCcounts", ";#it{p}_{T}^{rec} (GeV/#it{c});^{3}#bar{He} n#sigma_{TPC};Counts", kNPtBins, kPtBins, 100, -5, 5}, "pt", "nsigmaHe3"));
+  hTPCMHe3.push_back(dfPrimary.Filter(TPCSelection{true}, {"matter", "fDCAxy", "hasGoodTOFmassHe3"}).Histo2D({"fMTPCcounts", ";#it{p}_{T}^{rec} (GeV/#it{c});^{3}He n#sigma_{TPC};Counts", kNPtBins, kPtBins, 100, -5, 5}, "pt", "nsigmaHe3"));
 
-  hTOFAHe3.push_back(dfPrimary.Filter("!matter && std::abs(nsigmaHe3) < 3.5").Histo2D({"fATOFsignal", ";#it{p}_{T}^{rec} (GeV/#it{c});m_{TOF}-m_{^{3}#bar{He}};Counts", kNPtBins, kPtBins, 100, -0.9, 1.1}, "pt", "deltaMassHe3"));
-  hTOFMHe3.push_back(dfPrimary.Filter("matter && std::abs(nsigmaHe3) < 3.5").Histo2D({"fMTOFsignal", ";#it{p}_{T}^{rec} (GeV/#it{c});m_{TOF}-m_{^{3}He};Counts", kNPtBins, kPtBins, 100, -0.9, 1.1}, "pt", "deltaMassHe3"));
+  hTOFAHe3.push_back(dfPrimary.Filter(TOFSelection{false, 3.5f}, {"matter", "fDCAxy", "nsigmaHe3"}).Histo2D({"fATOFsignal", ";#it{p}_{T}^{rec} (GeV/#it{c});m_{TOF}-m_{^{3}#bar{He}};Counts", kNPtBins, kPtBins, 100, -0.9, 1.1}, "pt", "deltaMassHe3"));
+  hTOFMHe3.push_back(dfPrimary.Filter(TOFSelection{true, 3.5f}, {"matter", "fDCAxy", "nsigmaHe3"}).Histo2D({"fMTOFsignal", ";#it{p}_{T}^{rec} (GeV/#it{c});m_{TOF}-m_{^{3}He};Counts", kNPtBins, kPtBins, 100, -0.9, 1.1}, "pt", "deltaMassHe3"));
+
+  /// Trial histogram models differ only by name: build them once and rename a copy per trial
+  const ROOT::RDF::TH2DModel trialDCAModel{"", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 560, -0.7, 0.7};
+  const ROOT::RDF::TH2DModel trialTPCAModel{"", ";#it{p}_{T}^{rec} (GeV/#it{c});^{3}#bar{He} n#sigma_{TPC};Counts", kNPtBins, kPtBins, 100, -5, 5};
+  const ROOT::RDF::TH2DModel trialTPCMModel{"", ";#it{p}_{T}^{rec} (GeV/#it{c});^{3}He n#sigma_{TPC};Counts", kNPtBins, kPtBins, 100, -5, 5};
+  const ROOT::RDF::TH2DModel trialTOFAModel{"", ";#it{p}_{T}^{rec} (GeV/#it{c});m_{TOF}-m_{^{3}#bar{He}};Counts", kNPtBins, kPtBins, 100, -0.9, 1.1};
+  const ROOT::RDF::TH2DModel trialTOFMModel{"", ";#it{p}_{T}^{rec} (GeV/#it{c});m_{TOF}-m_{^{3}He};Counts", kNPtBins, kPtBins, 100, -0.9, 1.1};
+  auto trialModel = [](ROOT::RDF::TH2DModel model, const char* name) {
+    model.fName = name;
+    return model;
+  };
 
   int iTrial{0};
-  for (size_t iDCAz{0}; iDCAz < kCutNames["nsigmaDCAz"].size(); ++iDCAz)
+  for (size_t iDCAz{0}; iDCAz < kCutNames.at("nsigmaDCAz").size(); ++iDCAz)
   {
-    auto dfDCAz = dfBase.Filter("std::abs(nsigmaDCAz) < " + std::to_string(kCutNames["nsigmaDCAz"][iDCAz]));
-    for (size_t iTPCcls{0}; iTPCcls < kCutNames["fTPCnCls"].size(); ++iTPCcls)
+    auto dfDCAz = dfBase.Filter(AbsBelowCut{kCutNames.at("nsigmaDCAz")[iDCAz]}, {"nsigmaDCAz"});
+    for (size_t iTPCcls{0}; iTPCcls < kCutNames.at("fTPCnCls").size(); ++iTPCcls)
     {
-      auto dfTPCcls = dfDCAz.Filter("fTPCnCls > " + std::to_string(kCutNames["fTPCnCls"][iTPCcls]));
-      for (size_t iITScls{0}; iITScls < kCutNames["nITScls"].size(); ++iITScls)
+      auto dfTPCcls = dfDCAz.Filter(AboveCut{kCutNames.at("fTPCnCls")[iTPCcls]}, {"nTPCcls"});
+      for (size_t iITScls{0}; iITScls < kCutNames.at("nITScls").size(); ++iITScls)
       {
-        auto dfITScls = dfTPCcls.Filter("nITScls >= " + std::to_string(kCutNames["nITScls"][iITScls]));
-        hDCAxyAHe3.push_back(dfITScls.Filter("!matter && nsigmaHe3 > -0.5 && nsigmaHe3 < 3 && hasGoodTOFmassHe3").Histo2D({Form("hDCAxyAHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 560, -0.7, 0.7}, "pt", "fDCAxy"));
-        hDCAxyMHe3.push_back(dfITScls.Filter("matter && nsigmaHe3 > -0.5 && nsigmaHe3 < 3 && hasGoodTOFmassHe3").Histo2D({Form("hDCAxyMHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 560, -0.7, 0.7}, "pt", "fDCAxy"));
-        hDCAzAHe3.push_back(dfITScls.Filter("!matter && nsigmaHe3 > -0.5 && nsigmaHe3 < 3 && hasGoodTOFmassHe3").Histo2D({Form("hDCzAHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 560, -0.7, 0.7}, "pt", "fDCAz"));
-        hDCAzMHe3.push_back(dfITScls.Filter("matter && nsigmaHe3 > -0.5 && nsigmaHe3 < 3 && hasGoodTOFmassHe3").Histo2D({Form("hDCAzMHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 560, -0.7, 0.7}, "pt", "fDCAz"));
+        auto dfITScls = dfTPCcls.Filter(AtLeastCut{kCutNames.at("nITScls")[iITScls]}, {"nITScls"});
+        hDCAxyAHe3.push_back(dfITScls.Filter(DCASelection{false}, {"matter", "nsigmaHe3", "hasGoodTOFmassHe3"}).Histo2D(trialModel(trialDCAModel, Form("hDCAxyAHe3%i", iTrial)), "pt", "fDCAxy"));
+        hDCAxyMHe3.push_back(dfITScls.Filter(DCASelection{true}, {"matter", "nsigmaHe3", "hasGoodTOFmassHe3"}).Histo2D(trialModel(trialDCAModel, Form("hDCAxyMHe3%i", iTrial)), "pt", "fDCAxy"));
+        hDCAzAHe3.push_back(dfITScls.Filter(DCASelection{false}, {"matter", "nsigmaHe3", "hasGoodTOFmassHe3"}).Histo2D(trialModel(trialDCAModel, Form("hDCzAHe3%i", iTrial)), "pt", "fDCAz"));
+        hDCAzMHe3.push_back(dfITScls.Filter(DCASelection{true}, {"matter", "nsigmaHe3", "hasGoodTOFmassHe3"}).Histo2D(trialModel(trialDCAModel, Form("hDCAzMHe3%i", iTrial)), "pt", "fDCAz"));
 
-        hTPCAHe3.push_back(dfITScls.Filter("!matter && std::abs(fDCAxy) < 0.2 && hasGoodTOFmassHe3").Histo2D({Form("fATPCcounts%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});^{3}#bar{He} n#sigma_{TPC};Counts", kNPtBins, kPtBins, 100, -5, 5}, "pt", "nsigmaHe3"));
-        hTPCMHe3.push_back(dfITScls.Filter("matter && std::abs(fDCAxy) < 0.2 && hasGoodTOFmassHe3").Histo2D({Form("fMTPCcounts%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});^{3}He n#sigma_{TPC};Counts", kNPtBins, kPtBins, 100, -5, 5}, "pt", "nsigmaHe3"));
+        hTPCAHe3.push_back(dfITScls.Filter(TPCSelection{false}, {"matter", "fDCAxy", "hasGoodTOFmassHe3"}).Histo2D(trialModel(trialTPCAModel, Form("fATPCcounts%i", iTrial)), "pt", "nsigmaHe3"));
+        hTPCMHe3.push_back(dfITScls.Filter(TPCSelection{true}, {"matter", "fDCAxy", "hasGoodTOFmassHe3"}).Histo2D(trialModel(trialTPCMModel, Form("fMTPCcounts%i", iTrial)), "pt", "nsigmaHe3"));
 
-        hTOFAHe3.push_back(dfITScls.Filter("!matter && std::abs(fDCAxy) < 0.2 && std::abs(nsigmaHe3) < 3.5").Histo2D({Form("fATOFsignal%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});m_{TOF}-m_{^{3}#bar{He}};Counts", kNPtBins, kPtBins, 100, -0.9, 1.1}, "pt", "deltaMassHe3"));
-        hTOFMHe3.push_back(dfITScls.Filter("matter && std::abs(fDCAxy) < 0.2 && std::abs(nsigmaHe3) < 3.5").Histo2D({Form("fMTOFsignal%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});m_{TOF}-m_{^{3}He};Counts", kNPtBins, kPtBins, 100, -0.9, 1.1}, "pt", "deltaMassHe3"));
+        hTOFAHe3.push_back(dfITScls.Filter(TOFSelection{false, 3.5f}, {"matter", "fDCAxy", "nsigmaHe3"}).Histo2D(trialModel(trialTOFAModel, Form("fATOFsignal%i", iTrial)), "pt", "deltaMassHe3"));
+        hTOFMHe3.push_back(dfITScls.Filter(TOFSelection{true, 3.5f}, {"matter", "fDCAxy", "nsigmaHe3"}).Histo2D(trialModel(trialTOFMModel, Form("fMTOFsignal%i", iTrial)), "pt", "deltaMassHe3"));
         iTrial++;
       }
     }
@@ -86,7 +103,7 @@ void analyseData(std::string inputFileName = kDataTreeFilename, std::string outp
   hDCAxySecondaryAHe3[0]->GetZaxis()->SetRangeUser(hDCAxySecondaryMHe3[0]->GetMinimum(), hDCAxySecondaryMHe3[0]->GetMaximum());
   hDCAxySecondaryAHe3[0]->DrawClone("colz");
 
-  TFile outputFile(outputFileName.data(), "recreate");
+  TFile outputFile(outputFileName.data(), "recreate", "", kOutputCompression);
   auto dir = outputFile.mkdir("nuclei");
   dir->cd();
   hTPCAHe3[0]->Write("fATPCcounts");
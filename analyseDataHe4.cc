@@ -21,29 +21,29 @@ void analyseDataHe4(std::string inputFileName = kDataTreeFilename, std::string o
 
   std::vector<ROOT::RDF::RResultPtr<TH2D>> hDCAxyAHe3, hDCAxyMHe3, hDCAxySecondaryMHe3, hDCAxySecondaryAHe3, hDCAzAHe3, hDCAzMHe3, hTPCAHe3, hTPCMHe3, hTOFAHe3, hTOFMHe3;
 
-  hDCAxyAHe3.push_back(dfPrimary.Filter("!matter && nsigmaHe4 > -0.5 && nsigmaHe4 < 3 && hasGoodTOFmassHe4").Histo2D({"hDCAxyAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "ptHe4", "fDCAxy"));
-  hDCAxyMHe3.push_back(dfPrimary.Filter("matter && nsigmaHe4 > -0.5 && nsigmaHe4 < 3 && hasGoodTOFmassHe4").Histo2D({"hDCAxyMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "ptHe4", "fDCAxy"));
-  hDCAzAHe3.push_back(dfPrimary.Filter("!matter && nsigmaHe4 > -0.5 && nsigmaHe4 < 3 && hasGoodTOFmassHe4").Histo2D({"hDCAzAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{z} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "ptHe4", "fDCAz"));
-  hDCAzMHe3.push_back(dfPrimary.Filter("matter && nsigmaHe4 > -0.5 && nsigmaHe4 < 3 && hasGoodTOFmassHe4").Histo2D({"hDCAzMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{z} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "ptHe4", "fDCAz"));
-  hDCAxySecondaryMHe3.push_back(dfSecondary.Filter("matter && nsigmaHe4 > -0.5 && nsigmaHe4 < 3 && hasGoodTOFmassHe4").Histo2D({"hDCAxySecondaryMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "ptHe4", "fDCAxy"));
-  hDCAxySecondaryAHe3.push_back(dfSecondary.Filter("!matter && nsigmaHe4 > -0.5 && nsigmaHe4 < 3 && hasGoodTOFmassHe4").Histo2D({"hDCAxySecondaryAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "ptHe4", "fDCAxy"));
+  hDCAxyAHe3.push_back(dfPrimary.Filter(DCASelection{false}, {"matter", "nsigmaHe4", "hasGoodTOFmassHe4"}).Histo2D({"hDCAxyAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "ptHe4", "fDCAxy"));
+  hDCAxyMHe3.push_back(dfPrimary.Filter(DCASelection{true}, {"matter", "nsigmaHe4", "hasGoodTOFmassHe4"}).Histo2D({"hDCAxyMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "ptHe4", "fDCAxy"));
+  hDCAzAHe3.push_back(dfPrimary.Filter(DCASelection{false}, {"matter", "nsigmaHe4", "hasGoodTOFmassHe4"}).Histo2D({"hDCAzAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{z} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "ptHe4", "fDCAz"));
+  hDCAzMHe3.push_back(dfPrimary.Filter(DCASelection{true}, {"matter", "nsigmaHe4", "hasGoodTOFmassHe4"}).Histo2D({"hDCAzMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{z} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "ptHe4", "fDCAz"));
+  hDCAxySecondaryMHe3.push_back(dfSecondary.Filter(DCASelection{true}, {"matter", "nsigmaHe4", "hasGoodTOFmassHe4"}).Histo2D({"hDCAxySecondaryMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "ptHe4", "fDCAxy"));
+  hDCAxySecondaryAHe3.push_back(dfSecondary.Filter(DCASelection{false}, {"matter", "nsigmaHe4", "hasGoodTOFmassHe4"}).Histo2D({"hDCAxySecondaryAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 100, -0.2, 0.2}, "ptHe4", "fDCAxy"));
 
   hTPCAHe3.push_back(dfPrimary.Filter("!matter").Histo2D({"fATPCcounts", ";#it{p}_{T}^{rec} (GeV/#it{c});^{4}#bar{He} n#sigma_{TPC};Counts", 160, 0.5, 4.5, 100, -5, 5}, "ptUncorr", "nsigmaHe4"));
   hTPCMHe3.push_back(dfPrimary.Filter("matter").Histo2D({"fMTPCcounts", ";#it{p}_{T}^{rec} (GeV/#it{c});^{3}He n#sigma_{TPC};Counts", kNPtBins, kPtBins, 100, -5, 5}, "ptHe4", "nsigmaHe4"));
 
-  hTOFAHe3.push_back(dfPrimary.Filter("!matter && std::abs(nsigmaHe4) < 3").Histo2D({"fATOFsignal", ";#it{p}_{T}^{rec} (GeV/#it{c});m_{TOF}-m_{^{4}#bar{He}};Counts", kNPtBins, kPtBins, 100, -0.9, 1.1}, "ptHe4", "deltaMassHe4"));
-  hTOFMHe3.push_back(dfPrimary.Filter("matter && std::abs(nsigmaHe4) < 3").Histo2D({"fMTOFsignal", ";#it{p}_{T}^{rec} (GeV/#it{c});m_{TOF}-m_{^{4}He};Counts", kNPtBins, kPtBins, 100, -0.9, 1.1}, "ptHe4", "deltaMassHe4"));
+  hTOFAHe3.push_back(dfPrimary.Filter(TOFSelection{false, 3.f}, {"matter", "fDCAxy", "nsigmaHe4"}).Histo2D({"fATOFsignal", ";#it{p}_{T}^{rec} (GeV/#it{c});m_{TOF}-m_{^{4}#bar{He}};Counts", kNPtBins, kPtBins, 100, -0.9, 1.1}, "ptHe4", "deltaMassHe4"));
+  hTOFMHe3.push_back(dfPrimary.Filter(TOFSelection{true, 3.f}, {"matter", "fDCAxy", "nsigmaHe4"}).Histo2D({"fMTOFsignal", ";#it{p}_{T}^{rec} (GeV/#it{c});m_{TOF}-m_{^{4}He};Counts", kNPtBins, kPtBins, 100, -0.9, 1.1}, "ptHe4", "deltaMassHe4"));
 
   int iTrial{0};
-  // for (size_t iDCAz{0}; iDCAz < kCutNames["nsigmaDCAz"].size(); ++iDCAz)
+  // for (size_t iDCAz{0}; iDCAz < kCutNames.at("nsigmaDCAz").size(); ++iDCAz)
   // {
-  //   auto dfDCAz = dfBase.Filter("std::abs(nsigmaDCAz) < " + std::to_string(kCutNames["nsigmaDCAz"][iDCAz]));
-  //   for (size_t iTPCcls{0}; iTPCcls < kCutNames["fTPCnCls"].size(); ++iTPCcls)
+  //   auto dfDCAz = dfBase.Filter("std::abs(nsigmaDCAz) < " + std::to_string(kCutNames.at("nsigmaDCAz")[iDCAz]));
+  //   for (size_t iTPCcls{0}; iTPCcls < kCutNames.at("fTPCnCls").size(); ++iTPCcls)
   //   {
-  //     auto dfTPCcls = dfDCAz.Filter("fTPCnCls > " + std::to_string(kCutNames["fTPCnCls"][iTPCcls]));
-  //     for (size_t iITScls{0}; iITScls < kCutNames["nITScls"].size(); ++iITScls)
+  //     auto dfTPCcls = dfDCAz.Filter("fTPCnCls > " + std::to_string(kCutNames.at("fTPCnCls")[iTPCcls]));
+  //     for (size_t iITScls{0}; iITScls < kCutNames.at("nITScls").size(); ++iITScls)
   //     {
-  //       auto dfITScls = dfTPCcls.Filter("nITScls >= " + std::to_string(kCutNames["nITScls"][iITScls]));
+  //       auto dfITScls = dfTPCcls.Filter("nITScls >= " + std::to_string(kCutNames.at("nITScls")[iITScls]));
   //       hDCAxyAHe3.push_back(dfITScls.Filter("!matter && nsigmaHe4 > -0.5 && nsigmaHe4 < 3 && hasGoodTOFmassHe4").Histo2D({Form("hDCAxyAHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 560, -0.7, 0.7}, "ptHe4", "fDCAxy"));
   //       hDCAxyMHe3.push_back(dfITScls.Filter("matter && nsigmaHe4 > -0.5 && nsigmaHe4 < 3 && hasGoodTOFmassHe4").Histo2D({Form("hDCAxyMHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 560, -0.7, 0.7}, "ptHe4", "fDCAxy"));
   //       hDCAzAHe3.push_back(dfITScls.Filter("!matter && nsigmaHe4 > -0.5 && nsigmaHe4 < 3 && hasGoodTOFmassHe4").Histo2D({Form("hDCzAHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});DCA_{xy} (cm);Counts", kNPtBins, kPtBins, 560, -0.7, 0.7}, "ptHe4", "fDCAz"));
@@ -83,7 +83,7 @@ void analyseDataHe4(std::string inputFileName = kDataTreeFilename, std::string o
   hDCAxySecondaryAHe3[0]->GetZaxis()->SetRangeUser(hDCAxySecondaryMHe3[0]->GetMinimum(), hDCAxySecondaryMHe3[0]->GetMaximum());
   hDCAxySecondaryAHe3[0]->DrawClone("colz");
 
-  TFile outputFile(outputFileName.data(), "recreate");
+  TFile outputFile(outputFileName.data(), "recreate", "", kOutputCompression);
   auto dir = outputFile.mkdir("nuclei");
   dir->cd();
   hTPCAHe3[0]->Write("fATPCcounts");
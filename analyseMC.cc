@@ -30,20 +30,10 @@ void analyseMC(std::string inputFileName = kMCtreeFilename, std::string outputFi
   gStyle->SetOptStat(0);
   ROOT::EnableImplicitMT();
   ROOT::RDataFrame d("O2nucleitablemc", inputFileName);
-  auto dfData = defineColumnsForData(d);
-  auto df = dfData.Define("gP", "fgPt * std::cosh(fgEta)")
-                  .Define("gM", "std::abs(fPDGcode) == 1000020030 ? 2.809230089 : (std::abs(fPDGcode) == 1000010030 ? 2.80892 : (std::abs(fPDGcode) == 1000020040 ? 3.72738 : (std::abs(fPDGcode) == 1000010020 ? 1.87561 : 0.1)))")
-                  .Define("gE", "std::hypot(gM, gP)")
-                  .Define("gMt", "std::hypot(gM, fgPt)")
-                  .Define("yMC", "std::asinh(fgPt / gMt * std::sinh(fgEta))")
-                  .Define("deltaPtUncorrected", "ptUncorr - fgPt")
-                  .Define("deltaPt", "pt - fgPt")
-                  .Define("ptWeight", "(5.04194/1.3645054) * fgPt * std::exp(-fgPt * 1.35934)")
-                  .Define("isHe3", "std::abs(fPDGcode) == 1000020030")
-                  .Define("isHe4", "std::abs(fPDGcode) == 1000020040")
-                  .Filter("isHe3"); // Only He3
+  auto df = defineColumnsForMC(d).Define("deltaPt", "pt - fgPt")
+                                 .Filter("isHe3"); // Only He3
 
-  auto dfCutRecoBase = df.Filter(kBaseRecSelections + "&& isPrimary");
+  auto dfCutRecoBase = df.Filter(kBaseRecSelectionsMC);
   auto dfCutReco = dfCutRecoBase.Filter(kDefaultRecSelections);
   auto dfCutGen = df.Filter("isPrimary && std::abs(yMC) < 0.5");
 
@@ -54,19 +44,25 @@ void analyseMC(std::string inputFileName = kMCtreeFilename, std::string outputFi
   std::vector<ROOT::RDF::RResultPtr<TH2D>> hDCAxyAHe3, hDCAxyMHe3;
   std::vector<ROOT::RDF::RResultPtr<TH1D>> hRecoTPCAHe3, hRecoTPCMHe3, hRecoTOFAHe3, hRecoTOFMHe3, hGenAHe3, hGenMHe3;
   std::vector<ROOT::RDF::RResultPtr<TH1D>> hRecoTPCAHe3W, hRecoTPCMHe3W, hRecoTOFAHe3W, hRecoTOFMHe3W, hGenAHe3W, hGenMHe3W;
-  hRecoTPCAHe3.push_back(dfCutReco.Filter("!matter").Histo1D({"TPCAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
-  hRecoTPCMHe3.push_back(dfCutReco.Filter("matter").Histo1D({"TPCMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
-  hRecoTOFAHe3.push_back(dfCutReco.Filter("!matter && hasTOF").Histo1D({"TOFAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
-  hRecoTOFMHe3.push_back(dfCutReco.Filter("matter && hasTOF").Histo1D({"TOFMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
-  hGenAHe3.push_back(dfCutGen.Filter("fPDGcode < 0").Histo1D({"genAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "fgPt"));
-  hGenMHe3.push_back(dfCutGen.Filter("fPDGcode > 0").Histo1D({"genMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "fgPt"));
-
-  hRecoTPCAHe3W.push_back(dfCutReco.Filter("!matter").Histo1D({"TPCAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
-  hRecoTPCMHe3W.push_back(dfCutReco.Filter("matter").Histo1D({"TPCMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
-  hRecoTOFAHe3W.push_back(dfCutReco.Filter("!matter && hasTOF").Histo1D({"TOFAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
-  hRecoTOFMHe3W.push_back(dfCutReco.Filter("matter && hasTOF").Histo1D({"TOFMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
-  hGenAHe3W.push_back(dfCutGen.Filter("fPDGcode < 0").Histo1D({"genAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "fgPt", "ptWeight"));
-  hGenMHe3W.push_back(dfCutGen.Filter("fPDGcode > 0").Histo1D({"genMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "fgPt", "ptWeight"));
+  auto dfRecoA = dfCutReco.Filter("!matter");
+  auto dfRecoM = dfCutReco.Filter("matter");
+  auto dfRecoATOF = dfRecoA.Filter("hasTOF");
+  auto dfRecoMTOF = dfRecoM.Filter("hasTOF");
+  auto dfGenA = dfCutGen.Filter("fPDGcode < 0");
+  auto dfGenM = dfCutGen.Filter("fPDGcode > 0");
+  hRecoTPCAHe3.push_back(dfRecoA.Histo1D({"TPCAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
+  hRecoTPCMHe3.push_back(dfRecoM.Histo1D({"TPCMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
+  hRecoTOFAHe3.push_back(dfRecoATOF.Histo1D({"TOFAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
+  hRecoTOFMHe3.push_back(dfRecoMTOF.Histo1D({"TOFMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
+  hGenAHe3.push_back(dfGenA.Histo1D({"genAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "fgPt"));
+  hGenMHe3.push_back(dfGenM.Histo1D({"genMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "fgPt"));
+
+  hRecoTPCAHe3W.push_back(dfRecoA.Histo1D({"TPCAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
+  hRecoTPCMHe3W.push_back(dfRecoM.Histo1D({"TPCMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
+  hRecoTOFAHe3W.push_back(dfRecoATOF.Histo1D({"TOFAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
+  hRecoTOFMHe3W.push_back(dfRecoMTOF.Histo1D({"TOFMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
+  hGenAHe3W.push_back(dfGenA.Histo1D({"genAHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "fgPt", "ptWeight"));
+  hGenMHe3W.push_back(dfGenM.Histo1D({"genMHe3", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "fgPt", "ptWeight"));
 
 
   hDeltaPtHe3->DrawClone("col");
@@ -101,38 +97,44 @@ void analyseMC(std::string inputFileName = kMCtreeFilename, std::string outputFi
   hEffM->Draw("same");
 
   new TCanvas;
-  auto hGenRap = dfCutGen.Filter("fPDGcode < 0").Histo1D({"hGenRap", ";y;Counts", 40, -1, 1}, "yMC");
-  auto hGenEta = dfCutGen.Filter("fPDGcode < 0").Histo1D({"hGenEta", ";#eta;Counts", 40, -1, 1}, "fgEta");
+  auto hGenRap = dfGenA.Histo1D({"hGenRap", ";y;Counts", 40, -1, 1}, "yMC");
+  auto hGenEta = dfGenA.Histo1D({"hGenEta", ";#eta;Counts", 40, -1, 1}, "fgEta");
   hGenRap->DrawClone();
   hGenEta->SetLineColor(kRed);
   hGenEta->DrawClone("same");
 
+  /// Same |DCAxy| requirement as the data trial TPC and TOF selections
+  auto dfTrialBase = dfCutRecoBase.Filter(AbsBelowCut{0.2f}, {"fDCAxy"});
   int iTrial{0};
-  size_t nTrials{enableTrials ? kCutNames["nsigmaDCAz"].size() * kCutNames["fTPCnCls"].size() * kCutNames["nITScls"].size() : 0};
-  for (size_t iDCAz{0}; enableTrials && iDCAz < kCutNames["nsigmaDCAz"].size(); ++iDCAz)
+  size_t nTrials{enableTrials ? kCutNames.at("nsigmaDCAz").size() * kCutNames.at("fTPCnCls").size() * kCutNames.at("nITScls").size() : 0};
+  for (size_t iDCAz{0}; enableTrials && iDCAz < kCutNames.at("nsigmaDCAz").size(); ++iDCAz)
   {
-    auto dnsigmaDCAz = dfCutRecoBase.Filter("std::abs(nsigmaDCAz) < " + std::to_string(kCutNames["nsigmaDCAz"][iDCAz]));
-    for (size_t iTPCcls{0}; iTPCcls < kCutNames["fTPCnCls"].size(); ++iTPCcls)
+    auto dnsigmaDCAz = dfTrialBase.Filter(AbsBelowCut{kCutNames.at("nsigmaDCAz")[iDCAz]}, {"nsigmaDCAz"});
+    for (size_t iTPCcls{0}; iTPCcls < kCutNames.at("fTPCnCls").size(); ++iTPCcls)
     {
-      auto dfTPCcls = dnsigmaDCAz.Filter("fTPCnCls > " + std::to_string(kCutNames["fTPCnCls"][iTPCcls]));
-      for (size_t iITScls{0}; iITScls < kCutNames["nITScls"].size(); ++iITScls)
+      auto dfTPCcls = dnsigmaDCAz.Filter(AboveCut{kCutNames.at("fTPCnCls")[iTPCcls]}, {"nTPCcls"});
+      for (size_t iITScls{0}; iITScls < kCutNames.at("nITScls").size(); ++iITScls)
       {
-        auto dfITScls = dfTPCcls.Filter("nITScls >= " + std::to_string(kCutNames["nITScls"][iITScls]));
-        hRecoTPCAHe3.push_back(dfCutRecoBase.Filter("!matter").Histo1D({Form("TPCAHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
-        hRecoTPCMHe3.push_back(dfCutRecoBase.Filter("matter").Histo1D({Form("TPCMHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
-        hRecoTOFAHe3.push_back(dfCutRecoBase.Filter("!matter && hasTOF").Histo1D({Form("TOFAHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
-        hRecoTOFMHe3.push_back(dfCutRecoBase.Filter("matter && hasTOF").Histo1D({Form("TOFMHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
-
-        hRecoTPCAHe3W.push_back(dfCutRecoBase.Filter("!matter").Histo1D({Form("TPCAHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
-        hRecoTPCMHe3W.push_back(dfCutRecoBase.Filter("matter").Histo1D({Form("TPCMHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
-        hRecoTOFAHe3W.push_back(dfCutRecoBase.Filter("!matter && hasTOF").Histo1D({Form("TOFAHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
-        hRecoTOFMHe3W.push_back(dfCutRecoBase.Filter("matter && hasTOF").Histo1D({Form("TOFMHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
+        auto dfITScls = dfTPCcls.Filter(AtLeastCut{kCutNames.at("nITScls")[iITScls]}, {"nITScls"});
+        auto dfTrialA = dfITScls.Filter("!matter");
+        auto dfTrialM = dfITScls.Filter("matter");
+        auto dfTrialATOF = dfTrialA.Filter("hasTOF");
+        auto dfTrialMTOF = dfTrialM.Filter("hasTOF");
+        hRecoTPCAHe3.push_back(dfTrialA.Histo1D({Form("TPCAHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
+        hRecoTPCMHe3.push_back(dfTrialM.Histo1D({Form("TPCMHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
+        hRecoTOFAHe3.push_back(dfTrialATOF.Histo1D({Form("TOFAHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
+        hRecoTOFMHe3.push_back(dfTrialMTOF.Histo1D({Form("TOFMHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
+
+        hRecoTPCAHe3W.push_back(dfTrialA.Histo1D({Form("TPCAHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
+        hRecoTPCMHe3W.push_back(dfTrialM.Histo1D({Form("TPCMHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
+        hRecoTOFAHe3W.push_back(dfTrialATOF.Histo1D({Form("TOFAHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
+        hRecoTOFMHe3W.push_back(dfTrialMTOF.Histo1D({Form("TOFMHe3%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
         iTrial++;
       }
     }
   }
 
-  TFile outputFile(outputFileName.data(), "recreate");
+  TFile outputFile(outputFileName.data(), "recreate", "", kOutputCompression);
   auto dir = outputFile.mkdir("nuclei");
   dir->cd();
   hGenAHe3[0]->Write("genAHe3");
@@ -201,59 +203,19 @@ void analyseMC(std::string inputFileName = kMCtreeFilename, std::string outputFi
     hRecoTOFAHe3W[iT + 1]->Write("TOFAHe3W");
     hRecoTOFMHe3W[iT + 1]->Write("TOFMHe3W");
 
-    auto effTPCA = (TH1 *)hRecoTPCAHe3[iT + 1]->Clone(Form("effTPCA%i", iT));
-    auto effTPCM = (TH1 *)hRecoTPCMHe3[iT + 1]->Clone(Form("effTPCM%i", iT));
-    auto effTOFA = (TH1 *)hRecoTOFAHe3[iT + 1]->Clone(Form("effTOFA%i", iT));
-    auto effTOFM = (TH1 *)hRecoTOFMHe3[iT + 1]->Clone(Form("effTOFM%i", iT));
-    effTPCA->Divide(hGenAHe3[0].GetPtr());
-    effTPCM->Divide(hGenMHe3[0].GetPtr());
-    effTPCA->SetLineColor(kRed);
-    effTPCM->SetLineColor(kRed);
-    effTOFA->Divide(hGenAHe3[0].GetPtr());
-    effTOFM->SetLineColor(kBlue);
-    effTOFA->SetLineColor(kBlue);
-    effTOFM->Divide(hGenMHe3[0].GetPtr());
-    effTPCA->GetYaxis()->SetTitle("Efficiency #times Acceptance");
-    effTPCM->GetYaxis()->SetTitle("Efficiency #times Acceptance");
-    effTOFA->GetYaxis()->SetTitle("Efficiency #times Acceptance");
-    effTOFM->GetYaxis()->SetTitle("Efficiency #times Acceptance");
-    effTPCA->Write("effTPCA");
-    effTPCM->Write("effTPCM");
-    effTOFA->Write("effTOFA");
-    effTOFM->Write("effTOFM");
-    auto matchingTOFA = (TH1 *)hRecoTOFAHe3[iT + 1]->Clone(Form("matchingTOFA%i", iT));
-    auto matchingTOFM = (TH1 *)hRecoTOFMHe3[iT + 1]->Clone(Form("matchingTOFM%i", iT));
-    matchingTOFA->Divide(effTPCA);
-    matchingTOFM->Divide(effTPCM);
-    matchingTOFA->Write();
-    matchingTOFM->Write();
-
-    auto effWTPCA = (TH1 *)hRecoTPCAHe3W[iT + 1]->Clone(Form("effWTPCA%i", iT));
-    auto effWTPCM = (TH1 *)hRecoTPCMHe3W[iT + 1]->Clone(Form("effWTPCM%i", iT));
-    auto effWTOFA = (TH1 *)hRecoTOFAHe3W[iT + 1]->Clone(Form("effWTOFA%i", iT));
-    auto effWTOFM = (TH1 *)hRecoTOFMHe3W[iT + 1]->Clone(Form("effWTOFM%i", iT));
-    effWTPCA->Divide(hGenAHe3W[0].GetPtr());
-    effWTPCM->Divide(hGenMHe3W[0].GetPtr());
-    effWTPCA->SetLineColor(kRed);
-    effWTPCM->SetLineColor(kRed);
-    effWTOFA->Divide(hGenAHe3W[0].GetPtr());
-    effWTOFM->SetLineColor(kBlue);
-    effWTOFA->SetLineColor(kBlue);
-    effWTOFM->Divide(hGenMHe3W[0].GetPtr());
-    effWTPCA->GetYaxis()->SetTitle("Efficiency #times Acceptance");
-    effWTPCM->GetYaxis()->SetTitle("Efficiency #times Acceptance");
-    effWTOFA->GetYaxis()->SetTitle("Efficiency #times Acceptance");
-    effWTOFM->GetYaxis()->SetTitle("Efficiency #times Acceptance");
-    effWTPCA->Write("effWTPCA");
-    effWTPCM->Write("effWTPCM");
-    effWTOFA->Write("effWTOFA");
-    effWTOFM->Write("effWTOFM");
-    auto matchingWTOFA = (TH1 *)hRecoTOFAHe3W[iT + 1]->Clone(Form("matchingWTOFA%i", iT));
-    auto matchingWTOFM = (TH1 *)hRecoTOFMHe3W[iT + 1]->Clone(Form("matchingWTOFM%i", iT));
-    matchingWTOFA->Divide(effWTPCA);
-    matchingWTOFM->Divide(effWTPCM);
-    matchingWTOFA->Write();
-    matchingWTOFM->Write();
+    auto effTPCA = writeTrialEfficiency(hRecoTPCAHe3[iT + 1].GetPtr(), hGenAHe3[0].GetPtr(), Form("effTPCA%i", iT), "effTPCA", kRed);
+    auto effTPCM = writeTrialEfficiency(hRecoTPCMHe3[iT + 1].GetPtr(), hGenMHe3[0].GetPtr(), Form("effTPCM%i", iT), "effTPCM", kRed);
+    writeTrialEfficiency(hRecoTOFAHe3[iT + 1].GetPtr(), hGenAHe3[0].GetPtr(), Form("effTOFA%i", iT), "effTOFA", kBlue);
+    writeTrialEfficiency(hRecoTOFMHe3[iT + 1].GetPtr(), hGenMHe3[0].GetPtr(), Form("effTOFM%i", iT), "effTOFM", kBlue);
+    writeTOFmatching(hRecoTOFAHe3[iT + 1].GetPtr(), effTPCA, Form("matchingTOFA%i", iT));
+    writeTOFmatching(hRecoTOFMHe3[iT + 1].GetPtr(), effTPCM, Form("matchingTOFM%i", iT));
+
+    auto effWTPCA = writeTrialEfficiency(hRecoTPCAHe3W[iT + 1].GetPtr(), hGenAHe3W[0].GetPtr(), Form("effWTPCA%i", iT), "effWTPCA", kRed);
+    auto effWTPCM = writeTrialEfficiency(hRecoTPCMHe3W[iT + 1].GetPtr(), hGenMHe3W[0].GetPtr(), Form("effWTPCM%i", iT), "effWTPCM", kRed);
+    writeTrialEfficiency(hRecoTOFAHe3W[iT + 1].GetPtr(), hGenAHe3W[0].GetPtr(), Form("effWTOFA%i", iT), "effWTOFA", kBlue);
+    writeTrialEfficiency(hRecoTOFMHe3W[iT + 1].GetPtr(), hGenMHe3W[0].GetPtr(), Form("effWTOFM%i", iT), "effWTOFM", kBlue);
+    writeTOFmatching(hRecoTOFAHe3W[iT + 1].GetPtr(), effWTPCA, Form("matchingWTOFA%i", iT));
+    writeTOFmatching(hRecoTOFMHe3W[iT + 1].GetPtr(), effWTPCM, Form("matchingWTOFM%i", iT));
 
 
   }
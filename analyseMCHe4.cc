@@ -20,19 +20,9 @@ void analyseMCHe4(std::string inputFileName = kMCtreeFilename, std::string outpu
   gStyle->SetOptStat(0);
   ROOT::EnableImplicitMT();
   ROOT::RDataFrame d("O2nucleitablemc", inputFileName);
-  auto dfData = defineColumnsForData(d);
-  auto df = dfData.Define("gP", "fgPt * std::cosh(fgEta)")
-                  .Define("gM", "std::abs(fPDGcode) == 1000020030 ? 2.809230089 : (std::abs(fPDGcode) == 1000010030 ? 2.80892 : (std::abs(fPDGcode) == 1000020040 ? 3.72738 : (std::abs(fPDGcode) == 1000010020 ? 1.87561 : 0.1)))")
-                  .Define("gE", "std::hypot(gM, gP)")
-                  .Define("gMt", "std::hypot(gM, fgPt)")
-                  .Define("yMC", "std::asinh(fgPt / gMt * std::sinh(fgEta))")
-                  .Define("deltaPtUncorrected", "ptUncorr - fgPt")
-                  .Define("deltaPt", "ptHe4 - fgPt")
-                  .Define("ptWeight", "(5.04194/1.3645054) * fgPt * std::exp(-fgPt * 1.35934)")
-                  .Define("rapidity", "std::asinh(pt / std::hypot(pt, gM) * std::sinh(fEta))")
-                  .Define("isHe3", "std::abs(fPDGcode) == 1000020030")
-                  .Define("isHe4", "std::abs(fPDGcode) == 1000020040")
-                  .Filter("isHe4 && isPrimary"); //
+  auto df = defineColumnsForMC(d).Define("deltaPt", "ptHe4 - fgPt")
+                                 .Define("rapidity", "computeRapidity(pt, sinhEta, gM)")
+                                 .Filter("isHe4 && isPrimary"); //
 
   auto dfCutReco = df.Filter("nITScls > 4 && fTPCnCls > 110 && std::abs(fEta) < 0.9 && std::abs(rapidity) < 0.5");
   auto dfCutGen = df.Filter("std::abs(yMC) < 0.5");
@@ -47,19 +37,25 @@ void analyseMCHe4(std::string inputFileName = kMCtreeFilename, std::string outpu
   std::vector<ROOT::RDF::RResultPtr<TH2D>> hDCAxyAHe4, hDCAxyMHe4;
   std::vector<ROOT::RDF::RResultPtr<TH1D>> hRecoTPCAHe4, hRecoTPCMHe4, hRecoTOFAHe4, hRecoTOFMHe4, hGenAHe4, hGenMHe4;
   std::vector<ROOT::RDF::RResultPtr<TH1D>> hRecoTPCAHe4W, hRecoTPCMHe4W, hRecoTOFAHe4W, hRecoTOFMHe4W, hGenAHe4W, hGenMHe4W;
-  hRecoTPCAHe4.push_back(dfCutReco.Filter("!matter && fTPCnCls > 120 && nITScls >= 6 && std::abs(fDCAz) < 0.7").Histo1D({"TPCAHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
-  hRecoTPCMHe4.push_back(dfCutReco.Filter("matter && fTPCnCls > 120 && nITScls >= 6 && std::abs(fDCAz) < 0.7").Histo1D({"TPCMHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
-  hRecoTOFAHe4.push_back(dfCutReco.Filter("!matter && fTPCnCls > 120 && nITScls >= 6 && std::abs(fDCAz) < 0.7 && hasTOF").Histo1D({"TOFAHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
-  hRecoTOFMHe4.push_back(dfCutReco.Filter("matter && fTPCnCls > 120 && nITScls >= 6 && std::abs(fDCAz) < 0.7 && hasTOF").Histo1D({"TOFMHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
-  hGenAHe4.push_back(dfCutGen.Filter("fPDGcode < 0").Histo1D({"genAHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "fgPt"));
-  hGenMHe4.push_back(dfCutGen.Filter("fPDGcode > 0").Histo1D({"genMHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "fgPt"));
-
-  hRecoTPCAHe4W.push_back(dfCutReco.Filter("!matter && fTPCnCls > 120 && nITScls >= 6 && std::abs(fDCAz) < 0.7").Histo1D({"TPCAHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
-  hRecoTPCMHe4W.push_back(dfCutReco.Filter("matter && fTPCnCls > 120 && nITScls >= 6 && std::abs(fDCAz) < 0.7").Histo1D({"TPCMHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
-  hRecoTOFAHe4W.push_back(dfCutReco.Filter("!matter && fTPCnCls > 120 && nITScls >= 6 && std::abs(fDCAz) < 0.7 && hasTOF").Histo1D({"TOFAHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
-  hRecoTOFMHe4W.push_back(dfCutReco.Filter("matter && fTPCnCls > 120 && nITScls >= 6 && std::abs(fDCAz) < 0.7 && hasTOF").Histo1D({"TOFMHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
-  hGenAHe4W.push_back(dfCutGen.Filter("fPDGcode < 0").Histo1D({"genAHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "fgPt", "ptWeight"));
-  hGenMHe4W.push_back(dfCutGen.Filter("fPDGcode > 0").Histo1D({"genMHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "fgPt", "ptWeight"));
+  auto dfRecoA = dfCutReco.Filter("!matter && fTPCnCls > 120 && nITScls >= 6 && std::abs(fDCAz) < 0.7");
+  auto dfRecoM = dfCutReco.Filter("matter && fTPCnCls > 120 && nITScls >= 6 && std::abs(fDCAz) < 0.7");
+  auto dfRecoATOF = dfRecoA.Filter("hasTOF");
+  auto dfRecoMTOF = dfRecoM.Filter("hasTOF");
+  auto dfGenA = dfCutGen.Filter("fPDGcode < 0");
+  auto dfGenM = dfCutGen.Filter("fPDGcode > 0");
+  hRecoTPCAHe4.push_back(dfRecoA.Histo1D({"TPCAHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
+  hRecoTPCMHe4.push_back(dfRecoM.Histo1D({"TPCMHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
+  hRecoTOFAHe4.push_back(dfRecoATOF.Histo1D({"TOFAHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
+  hRecoTOFMHe4.push_back(dfRecoMTOF.Histo1D({"TOFMHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
+  hGenAHe4.push_back(dfGenA.Histo1D({"genAHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "fgPt"));
+  hGenMHe4.push_back(dfGenM.Histo1D({"genMHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "fgPt"));
+
+  hRecoTPCAHe4W.push_back(dfRecoA.Histo1D({"TPCAHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
+  hRecoTPCMHe4W.push_back(dfRecoM.Histo1D({"TPCMHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
+  hRecoTOFAHe4W.push_back(dfRecoATOF.Histo1D({"TOFAHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
+  hRecoTOFMHe4W.push_back(dfRecoMTOF.Histo1D({"TOFMHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
+  hGenAHe4W.push_back(dfGenA.Histo1D({"genAHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "fgPt", "ptWeight"));
+  hGenMHe4W.push_back(dfGenM.Histo1D({"genMHe4", ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "fgPt", "ptWeight"));
 
 
   hDeltaPtHe4->DrawClone("col");
@@ -104,38 +100,42 @@ void analyseMCHe4(std::string inputFileName = kMCtreeFilename, std::string outpu
   hEffM->Draw("same");
 
   new TCanvas;
-  auto hGenRap = dfCutGen.Filter("fPDGcode < 0").Histo1D({"hGenRap", ";y;Counts", 40, -1, 1}, "yMC");
-  auto hGenEta = dfCutGen.Filter("fPDGcode < 0").Histo1D({"hGenEta", ";#eta;Counts", 40, -1, 1}, "fgEta");
+  auto hGenRap = dfGenA.Histo1D({"hGenRap", ";y;Counts", 40, -1, 1}, "yMC");
+  auto hGenEta = dfGenA.Histo1D({"hGenEta", ";#eta;Counts", 40, -1, 1}, "fgEta");
   hGenRap->DrawClone();
   hGenEta->SetLineColor(kRed);
   hGenEta->DrawClone("same");
 
   int iTrial{0};
-  size_t nTrials{enableTrials ? kCutNames["nsigmaDCAz"].size() * kCutNames["fTPCnCls"].size() * kCutNames["nITScls"].size() : 0};
-  for (size_t iDCAz{0}; enableTrials && iDCAz < kCutNames["nsigmaDCAz"].size(); ++iDCAz)
+  size_t nTrials{enableTrials ? kCutNames.at("nsigmaDCAz").size() * kCutNames.at("fTPCnCls").size() * kCutNames.at("nITScls").size() : 0};
+  for (size_t iDCAz{0}; enableTrials && iDCAz < kCutNames.at("nsigmaDCAz").size(); ++iDCAz)
   {
-    auto dnsigmaDCAz = dfCutReco.Filter("std::abs(nsigmaDCAz) < " + std::to_string(kCutNames["nsigmaDCAz"][iDCAz]));
-    for (size_t iTPCcls{0}; iTPCcls < kCutNames["fTPCnCls"].size(); ++iTPCcls)
+    auto dnsigmaDCAz = dfCutReco.Filter(AbsBelowCut{kCutNames.at("nsigmaDCAz")[iDCAz]}, {"nsigmaDCAz"});
+    for (size_t iTPCcls{0}; iTPCcls < kCutNames.at("fTPCnCls").size(); ++iTPCcls)
     {
-      auto dfTPCcls = dnsigmaDCAz.Filter("fTPCnCls > " + std::to_string(kCutNames["fTPCnCls"][iTPCcls]));
-      for (size_t iITScls{0}; iITScls < kCutNames["nITScls"].size(); ++iITScls)
+      auto dfTPCcls = dnsigmaDCAz.Filter(AboveCut{kCutNames.at("fTPCnCls")[iTPCcls]}, {"nTPCcls"});
+      for (size_t iITScls{0}; iITScls < kCutNames.at("nITScls").size(); ++iITScls)
       {
-        auto dfITScls = dfTPCcls.Filter("nITScls >= " + std::to_string(kCutNames["nITScls"][iITScls]));
-        hRecoTPCAHe4.push_back(dfCutReco.Filter("!matter").Histo1D({Form("TPCAHe4%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
-        hRecoTPCMHe4.push_back(dfCutReco.Filter("matter").Histo1D({Form("TPCMHe4%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
-        hRecoTOFAHe4.push_back(dfCutReco.Filter("!matter && hasTOF").Histo1D({Form("TOFAHe4%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
-        hRecoTOFMHe4.push_back(dfCutReco.Filter("matter && hasTOF").Histo1D({Form("TOFMHe4%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
-
-        hRecoTPCAHe4W.push_back(dfCutReco.Filter("!matter").Histo1D({Form("TPCAHe4%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
-        hRecoTPCMHe4W.push_back(dfCutReco.Filter("matter").Histo1D({Form("TPCMHe4%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
-        hRecoTOFAHe4W.push_back(dfCutReco.Filter("!matter && hasTOF").Histo1D({Form("TOFAHe4%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
-        hRecoTOFMHe4W.push_back(dfCutReco.Filter("matter && hasTOF").Histo1D({Form("TOFMHe4%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
+        auto dfITScls = dfTPCcls.Filter(AtLeastCut{kCutNames.at("nITScls")[iITScls]}, {"nITScls"});
+        auto dfTrialA = dfITScls.Filter("!matter");
+        auto dfTrialM = dfITScls.Filter("matter");
+        auto dfTrialATOF = dfTrialA.Filter("hasTOF");
+        auto dfTrialMTOF = dfTrialM.Filter("hasTOF");
+        hRecoTPCAHe4.push_back(dfTrialA.Histo1D({Form("TPCAHe4%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
+        hRecoTPCMHe4.push_back(dfTrialM.Histo1D({Form("TPCMHe4%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
+        hRecoTOFAHe4.push_back(dfTrialATOF.Histo1D({Form("TOFAHe4%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
+        hRecoTOFMHe4.push_back(dfTrialMTOF.Histo1D({Form("TOFMHe4%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt"));
+
+        hRecoTPCAHe4W.push_back(dfTrialA.Histo1D({Form("TPCAHe4%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
+        hRecoTPCMHe4W.push_back(dfTrialM.Histo1D({Form("TPCMHe4%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
+        hRecoTOFAHe4W.push_back(dfTrialATOF.Histo1D({Form("TOFAHe4%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
+        hRecoTOFMHe4W.push_back(dfTrialMTOF.Histo1D({Form("TOFMHe4%i", iTrial), ";#it{p}_{T}^{rec} (GeV/#it{c});Counts", kNPtBins, kPtBins}, "pt", "ptWeight"));
         iTrial++;
       }
     }
   }
 
-  TFile outputFile(outputFileName.data(), "recreate");
+  TFile outputFile(outputFileName.data(), "recreate", "", kOutputCompression);
   auto dir = outputFile.mkdir("nuclei");
   dir->cd();
   hGenAHe4[0]->Write("genAHe4");
@@ -196,59 +196,19 @@ void analyseMCHe4(std::string inputFileName = kMCtreeFilename, std::string outpu
     hRecoTOFAHe4W[iT + 1]->Write("TOFAHe4W");
     hRecoTOFMHe4W[iT + 1]->Write("TOFMHe4W");
 
-    auto effTPCA = (TH1 *)hRecoTPCAHe4[iT + 1]->Clone(Form("effTPCA%i", iT));
-    auto effTPCM = (TH1 *)hRecoTPCMHe4[iT + 1]->Clone(Form("effTPCM%i", iT));
-    auto effTOFA = (TH1 *)hRecoTOFAHe4[iT + 1]->Clone(Form("effTOFA%i", iT));
-    auto effTOFM = (TH1 *)hRecoTOFMHe4[iT + 1]->Clone(Form("effTOFM%i", iT));
-    effTPCA->Divide(hGenAHe4[0].GetPtr());
-    effTPCM->Divide(hGenMHe4[0].GetPtr());
-    effTPCA->SetLineColor(kRed);
-    effTPCM->SetLineColor(kRed);
-    effTOFA->Divide(hGenAHe4[0].GetPtr());
-    effTOFM->SetLineColor(kBlue);
-    effTOFA->SetLineColor(kBlue);
-    effTOFM->Divide(hGenMHe4[0].GetPtr());
-    effTPCA->GetYaxis()->SetTitle("Efficiency #times Acceptance");
-    effTPCM->GetYaxis()->SetTitle("Efficiency #times Acceptance");
-    effTOFA->GetYaxis()->SetTitle("Efficiency #times Acceptance");
-    effTOFM->GetYaxis()->SetTitle("Efficiency #times Acceptance");
-    effTPCA->Write("effTPCA");
-    effTPCM->Write("effTPCM");
-    effTOFA->Write("effTOFA");
-    effTOFM->Write("effTOFM");
-    auto matchingTOFA = (TH1 *)hRecoTOFAHe4[iT + 1]->Clone(Form("matchingTOFA%i", iT));
-    auto matchingTOFM = (TH1 *)hRecoTOFMHe4[iT + 1]->Clone(Form("matchingTOFM%i", iT));
-    matchingTOFA->Divide(effTPCA);
-    matchingTOFM->Divide(effTPCM);
-    matchingTOFA->Write();
-    matchingTOFM->Write();
-
-    auto effWTPCA = (TH1 *)hRecoTPCAHe4W[iT + 1]->Clone(Form("effWTPCA%i", iT));
-    auto effWTPCM = (TH1 *)hRecoTPCMHe4W[iT + 1]->Clone(Form("effWTPCM%i", iT));
-    auto effWTOFA = (TH1 *)hRecoTOFAHe4W[iT + 1]->Clone(Form("effWTOFA%i", iT));
-    auto effWTOFM = (TH1 *)hRecoTOFMHe4W[iT + 1]->Clone(Form("effWTOFM%i", iT));
-    effWTPCA->Divide(hGenAHe4W[0].GetPtr());
-    effWTPCM->Divide(hGenMHe4W[0].GetPtr());
-    effWTPCA->SetLineColor(kRed);
-    effWTPCM->SetLineColor(kRed);
-    effWTOFA->Divide(hGenAHe4W[0].GetPtr());
-    effWTOFM->SetLineColor(kBlue);
-    effWTOFA->SetLineColor(kBlue);
-    effWTOFM->Divide(hGenMHe4W[0].GetPtr());
-    effWTPCA->GetYaxis()->SetTitle("Efficiency #times Acceptance");
-    effWTPCM->GetYaxis()->SetTitle("Efficiency #times Acceptance");
-    effWTOFA->GetYaxis()->SetTitle("Efficiency #times Acceptance");
-    effWTOFM->GetYaxis()->SetTitle("Efficiency #times Acceptance");
-    effWTPCA->Write("effWTPCA");
-    effWTPCM->Write("effWTPCM");
-    effWTOFA->Write("effWTOFA");
-    effWTOFM->Write("effWTOFM");
-    auto matchingWTOFA = (TH1 *)hRecoTOFAHe4W[iT + 1]->Clone(Form("matchingWTOFA%i", iT));
-    auto matchingWTOFM = (TH1 *)hRecoTOFMHe4W[iT + 1]->Clone(Form("matchingWTOFM%i", iT));
-    matchingWTOFA->Divide(effWTPCA);
-    matchingWTOFM->Divide(effWTPCM);
-    matchingWTOFA->Write();
-    matchingWTOFM->Write();
+    auto effTPCA = writeTrialEfficiency(hRecoTPCAHe4[iT + 1].GetPtr(), hGenAHe4[0].GetPtr(), Form("effTPCA%i", iT), "effTPCA", kRed);
+    auto effTPCM = writeTrialEfficiency(hRecoTPCMHe4[iT + 1].GetPtr(), hGenMHe4[0].GetPtr(), Form("effTPCM%i", iT), "effTPCM", kRed);
+    writeTrialEfficiency(hRecoTOFAHe4[iT + 1].GetPtr(), hGenAHe4[0].GetPtr(), Form("effTOFA%i", iT), "effTOFA", kBlue);
+    writeTrialEfficiency(hRecoTOFMHe4[iT + 1].GetPtr(), hGenMHe4[0].GetPtr(), Form("effTOFM%i", iT), "effTOFM", kBlue);
+    writeTOFmatching(hRecoTOFAHe4[iT + 1].GetPtr(), effTPCA, Form("matchingTOFA%i", iT));
+    writeTOFmatching(hRecoTOFMHe4[iT + 1].GetPtr(), effTPCM, Form("matchingTOFM%i", iT));
+
+    auto effWTPCA = writeTrialEfficiency(hRecoTPCAHe4W[iT + 1].GetPtr(), hGenAHe4W[0].GetPtr(), Form("effWTPCA%i", iT), "effWTPCA", kRed);
+    auto effWTPCM = writeTrialEfficiency(hRecoTPCMHe4W[iT + 1].GetPtr(), hGenMHe4W[0].GetPtr(), Form("effWTPCM%i", iT), "effWTPCM", kRed);
+    writeTrialEfficiency(hRecoTOFAHe4W[iT + 1].GetPtr(), hGenAHe4W[0].GetPtr(), Form("effWTOFA%i", iT), "effWTOFA", kBlue);
+    writeTrialEfficiency(hRecoTOFMHe4W[iT + 1].GetPtr(), hGenMHe4W[0].GetPtr(), Form("effWTOFM%i", iT), "effWTOFM", kBlue);
+    writeTOFmatching(hRecoTOFAHe4W[iT + 1].GetPtr(), effWTPCA, Form("matchingWTOFA%i", iT));
+    writeTOFmatching(hRecoTOFMHe4W[iT + 1].GetPtr(), effWTPCM, Form("matchingWTOFM%i", iT));
 
 
   }
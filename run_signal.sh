@@ -1,12 +1,18 @@
 #!/bin/bash
 rootver=$(root-config --version)
-if (( ${rootver:0:1} < 6 )); then
-  echo "ROOT version 6 is required for this analysis."
+rootmajor=${rootver%%.*}
+rootminor=${rootver#*.}
+rootminor=${rootminor%%[./]*}
+if (( rootmajor < 6 || (rootmajor == 6 && 10#$rootminor < 20) )); then
+  echo "ROOT version 6.20 or newer is required for this analysis."
 else
+  aclicdir=${HE3PP_ACLIC_DIR:-$HOME/.cache/he3pp/aclic}
+  mkdir -p "$aclicdir"
   root -b -l << EOF
-.L src/RooGausExp.cxx+
-.L src/RooGausDExp.cxx+
-.L src/FitModules.cxx+
+gSystem->SetBuildDir("$aclicdir");
+.L src/RooGausExp.cxx+O
+.L src/RooGausDExp.cxx+O
+.L src/FitModules.cxx+O
 .x Signal.cc+g
 EOF
 
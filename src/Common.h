@@ -3,13 +3,17 @@
 
 #include "ROOT/RDataFrame.hxx"
 
+#include <algorithm>
+#include <cmath>
 #include <iostream>
 #include <map>
 #include <string>
 #include <vector>
 
+#include <Compression.h>
 #include <TList.h>
 #include <TF1.h>
+#include <TH1.h>
 #include <TObject.h>
 #include <TMath.h>
 #include <TSystem.h>
@@ -31,20 +35,28 @@ const string kVariant = "giovanni";
 const string kBaseOutputDir = "$NUCLEI_OUTPUT/" + kPeriod + "/" + kRecoPass + "/";
 const string kBaseInputDir = "$NUCLEI_INPUT/";
 
-const string kDataTreeFilename = kBaseInputDir + "data/" + kPeriod + "/" + kRecoPass + "/MergedAO2D.root";
-const string kDataFilename = kBaseInputDir + "data/" + kPeriod + "/" + kRecoPass + "/DataHistos" + kVariant + ".root";
-const string kDataFilenameHe4 = kBaseInputDir + "data/" + kPeriod + "/" + kRecoPass + "/DataHistosHe4" + kVariant + ".root";
-const string kDataAnalysisResults = kBaseInputDir + "data/" + kPeriod + "/" + kRecoPass + "/AnalysisResults.root";
-const string kMCAnalysisResults = kBaseInputDir + "MC/" + kMCproduction + "/AnalysisResults.root";
-const string kMCtreeFilename = kBaseInputDir + "MC/" + kMCproduction + "/MergedAO2D.root";
-const string kMCfilename = kBaseInputDir + "MC/" + kMCproduction + "/MChistos"  + kVariant + ".root";
-const string kMCfilenameHe4 = kBaseInputDir + "MC/" + kMCproduction + "/MChistosHe4"  + kVariant + ".root";
+const string kDataInputDir = kBaseInputDir + "data/" + kPeriod + "/" + kRecoPass + "/";
+const string kMCInputDir = kBaseInputDir + "MC/" + kMCproduction + "/";
+
+const string kDataTreeFilename = kDataInputDir + "MergedAO2D.root";
+const string kDataFilename = kDataInputDir + "DataHistos" + kVariant + ".root";
+const string kDataFilenameHe4 = kDataInputDir + "DataHistosHe4" + kVariant + ".root";
+const string kDataAnalysisResults = kDataInputDir + "AnalysisResults.root";
+const string kMCAnalysisResults = kMCInputDir + "AnalysisResults.root";
+const string kMCtreeFilename = kMCInputDir + "MergedAO2D.root";
+const string kMCfilename = kMCInputDir + "MChistos"  + kVariant + ".root";
+const string kMCfilenameHe4 = kMCInputDir + "MChistosHe4"  + kVariant + ".root";
 
 const string kFilterListNames = "nuclei";
 
 const string kBaseRecSelections = "fTPCnCls >= 110 && nITScls >= 5 && std::abs(fEta) < 0.9 && std::abs(fDCAxy) < 0.7 && pt > 0.8 && pt < 9.0";
+const string kBaseRecSelectionsMC = kBaseRecSelections + " && isPrimary";
 const string kDefaultRecSelections = "fTPCnCls > 120 && nITScls >= 6 && std::abs(nsigmaDCAz) < 7 && std::abs(fDCAxy) < 0.2";
 
+/// ZSTD decompresses several times faster than the default zlib at a comparable ratio for histogram files
+/// RCompressionSetting sets the minimum ROOT version of the analysis to 6.20
+const int kOutputCompression = ROOT::CompressionSettings(ROOT::RCompressionSetting::EAlgorithm::kZSTD, 5);
+
 const string kSignalOutput = kBaseOutputDir + "signal" + kVariant + ".root";
 const string kSystematicsOutput = kBaseOutputDir + "systematics" + kVariant + ".root";
 
@@ -53,6 +65,14 @@ const string kSystematicsOutput = kBaseOutputDir + "systematics" + kVariant + ".
 
 constexpr int    kNPtBins = 12;
 constexpr double  kPtBins[kNPtBins+1] = {1.5, 1.75, 2.0, 2.25, 2.5, 2.75, 3.0, 3.25, 3.5, 3.75, 4.0, 4.5, 5.0};
+constexpr bool isStrictlyIncreasing(const double* edges, int nEdges)
+{
+  for (int i{1}; i < nEdges; ++i)
+    if (!(edges[i - 1] < edges[i]))
+      return false;
+  return true;
+}
+static_assert(isStrictlyIncreasing(kPtBins, kNPtBins + 1), "kPtBins edges must be strictly increasing");
 
 const int    kCentLength = 1;
 const int    kCentBinsArray[kCentLength][2] = {{2,2}};
@@ -70,73 +90,210 @@ constexpr int kNTPCfunctions = 3;
 const std::string kTPCfunctName[4]{"GausGaus", "ExpGaus", "ExpTailGaus", "LognormalLognormal"};
 
 
-std::map<string,vector<float> > kCutNames {{"nsigmaDCAz", {6, 7, 8}},{"fTPCnCls", {110, 120, 130}},{"nITScls", {5, 6, 7}}, {"nsigmaTPC", {3, 4, 5}}};
-size_t nTrials{kCutNames["fDCAz"].size() * kCutNames["fTPCnCls"].size() * kCutNames["nITScls"].size()};
+enum TrackFlag : uint16_t {
+  kHasTOF = 1 << 5,
+  kIsPrimary = 1 << 9,
+  kIsSecondaryFromMaterial = 1 << 10,
+  kIsSecondaryFromWeakDecay = 1 << 11
+};
 
-double bb(double bg, double kp1, double kp2, double kp3, double kp4, double kp5)
+const std::map<string,vector<float> > kCutNames {{"nsigmaDCAz", {6, 7, 8}},{"fTPCnCls", {110, 120, 130}},{"nITScls", {5, 6, 7}}, {"nsigmaTPC", {3, 4, 5}}};
+const size_t nTrials{kCutNames.at("nsigmaDCAz").size() * kCutNames.at("fTPCnCls").size() * kCutNames.at("nITScls").size()};
+
+struct BetheBlochParams {
+  double kp1, kp2, kp3, kp4, kp5;
+};
+
+constexpr BetheBlochParams kBBparamsHe{-321.34, 0.6539, 1.591, 0.8225, 2.363};
+constexpr BetheBlochParams kBBparamsH3{-136.71, 0.441, 0.2269, 1.347, 0.8035};
+
+/// beta^kp4 and (1/bg)^kp5 are evaluated as exponentials sharing log(bg), instead of two std::pow calls
+inline double bb(double bg, const BetheBlochParams& par)
 {
-  double beta = bg / std::sqrt(1. + bg * bg);
-  double aa = std::pow(beta, kp4);
-  double bb = std::pow(1. / bg, kp5);
-  bb = std::log(kp3 + bb);
-  return (kp2 - aa - bb) * kp1 / aa;
+  const double logBg = std::log(bg);
+  const double logBeta = logBg - 0.5 * std::log1p(bg * bg);
+  const double aa = std::exp(par.kp4 * logBeta);
+  const double bb = std::log(par.kp3 + std::exp(-par.kp5 * logBg));
+  return (par.kp2 - aa - bb) * par.kp1 / aa;
 }
 
-float bbHe3(float mom) { return bb(mom / 2.80839, -321.34, 0.6539, 1.591, 0.8225, 2.363); }
+float bbHe3(float mom) { return bb(mom / 2.80839, kBBparamsHe); }
 float nsigmaHe3(float mom, float sig) { return (sig / bbHe3(mom * 2) - 1. + 2.20376e-02) / 0.055; }
 
-float bbH3(float mom) { return bb(mom / 2.80892f, -136.71, 0.441, 0.2269, 1.347, 0.8035); }
+float bbH3(float mom) { return bb(mom / 2.80892f, kBBparamsH3); }
 float nsigmaH3(float mom, float sig) { return (sig / bbH3(mom) - 1.) / 0.07; }
 
-float bbHe4(float mom) { return bb(mom / 3.72738f, -321.34, 0.6539, 1.591, 0.8225, 2.363); }
+float bbHe4(float mom) { return bb(mom / 3.72738f, kBBparamsHe); }
 float nsigmaHe4(float mom, float sig) { return (sig / bbHe4(mom * 2) - 1.) / 0.07; }
 
+double ptCorrHe3(float ptUncorr) { return ptUncorr + 0.0343554 + 0.96161 * std::exp(-1.51286 * ptUncorr); }
+double ptCorrHe4(float ptUncorr)
+{
+  const double ptStep1 = ptUncorr + 0.0419608 + 1.75861 * std::exp(-1.4019 * ptUncorr);
+  return ptStep1 + 0.00385223 - 0.442353 * std::exp(-1.59049 * ptStep1);
+}
+
+/// Tracks without a TOF match (beta < 1e-3) get 1e9, beta >= 1 gives 0; written with selects so the per-track loop has no branches
+float computeTOFmass(float beta, float innerParam)
+{
+  const float clampedBeta = std::max(beta, 1.e-3f);
+  const float mass = innerParam * 2.f * std::sqrt(std::max(1.f / (clampedBeta * clampedBeta) - 1.f, 0.f));
+  return beta < 1.e-3f ? 1.e9f : mass;
+}
+
+/// Truncated Taylor series of sinh, accurate to better than 1e-9 within the |eta| < 1 tracking acceptance
+double fastSinh(float eta)
+{
+  const double x = eta;
+  if (std::abs(x) >= 1.)
+    return std::sinh(x);
+  const double x2 = x * x;
+  return x * (1. + x2 * (1. / 6. + x2 * (1. / 120. + x2 * (1. / 5040. + x2 * (1. / 362880. + x2 * (1. / 39916800.))))));
+}
+
+double computeRapidity(double pt, double sinhEta, double mass) { return std::asinh(pt * sinhEta / std::sqrt(pt * pt + mass * mass)); }
+double computeRapidityHe3(double pt, double sinhEta) { return computeRapidity(pt, sinhEta, 2.80839); }
+double computeRapidityHe4(double pt, double sinhEta) { return computeRapidity(pt, sinhEta, 3.72738); }
+
+float computePtUncorr(float signedPt) { return 2.f * std::abs(signedPt); }
+double computeMomentum(double pt, float eta) { return pt * std::cosh(eta); }
+bool isMatter(float signedPt) { return signedPt > 0; }
+
+double computeDeltaMassHe3(float tofMass) { return tofMass - 2.80839; }
+double computeDeltaMassHe4(float tofMass) { return tofMass - 3.72738; }
+bool passTOFmassCutHe3(bool hasTOF, double deltaMass) { return !hasTOF || std::abs(deltaMass) < 0.6; }
+bool passTOFmassCutHe4(bool hasTOF, double deltaMass) { return !hasTOF || std::abs(deltaMass) < 0.3; }
+
+/// Number of inner barrel (low nibble) and total (high nibble) ITS clusters for each 7-bit cluster map
+struct ITSclsLUT {
+  constexpr ITSclsLUT() : counts{}
+  {
+    for (int map{0}; map < 128; ++map) {
+      int nIB{0}, nAll{0};
+      for (int layer{0}; layer < 7; ++layer) {
+        const bool hit = map & (1 << layer);
+        nIB += hit && layer < 3;
+        nAll += hit;
+      }
+      counts[map] = nIB | (nAll << 4);
+    }
+  }
+  uint8_t counts[128];
+};
+constexpr ITSclsLUT kITSclsLUT{};
+
+int countITSclsIB(unsigned int clsMap) { return kITSclsLUT.counts[clsMap & 0x7Fu] & 0xF; }
+int countITScls(unsigned int clsMap) { return kITSclsLUT.counts[clsMap & 0x7Fu] >> 4; }
+
 float DCAxyCut(float pt, float nsigma)
 {
-  float invPt = 1.f / pt;
-  return (7.62783e-04 + 4.59326e-03 * invPt + 6.89163e-03 * invPt * invPt) * nsigma;
+  const float invPt = 1.f / pt;
+  return ((6.89163e-03f * invPt + 4.59326e-03f) * invPt + 7.62783e-04f) * nsigma;
 }
+/// Same parametrisation multiplied through by pt^2, so that only one division is needed per track
 float nSigmaDCAxy(double pt, float dcaxy) {
-  return dcaxy / DCAxyCut(pt, 1);
+  const float ptF = pt;
+  return dcaxy * ptF * ptF / ((7.62783e-04f * ptF + 4.59326e-03f) * ptF + 6.89163e-03f);
 }
 
 float DCAzCut(float pt, float nsigma)
 {
-  float invPt = 1.f / pt;
-  return (5.00000e-04 + 8.73690e-03 * invPt + 9.62329e-04 * invPt * invPt) * nsigma;
+  const float invPt = 1.f / pt;
+  return ((9.62329e-04f * invPt + 8.73690e-03f) * invPt + 5.00000e-04f) * nsigma;
 }
 
 float nSigmaDCAz(double pt, float dcaz) {
-  return dcaz / DCAzCut(pt, 1);
+  const float ptF = pt;
+  return dcaz * ptF * ptF / ((5.00000e-04f * ptF + 8.73690e-03f) * ptF + 9.62329e-04f);
 }
 
+/// Trial-cut predicates with the threshold held at runtime, so every trial reuses the same compiled filter
+struct AbsBelowCut {
+  float cut;
+  bool operator()(float x) const { return std::abs(x) < cut; }
+};
+struct AboveCut {
+  float cut;
+  bool operator()(int x) const { return x > cut; }
+};
+struct AtLeastCut {
+  float cut;
+  bool operator()(int x) const { return x >= cut; }
+};
+
+/// Candidate selections shared by the data histograms, for matter (true) or antimatter (false) tracks
+struct DCASelection {
+  bool matter;
+  bool operator()(bool isMatter, float nsigma, bool hasGoodTOFmass) const { return isMatter == matter && nsigma > -0.5f && nsigma < 3.f && hasGoodTOFmass; }
+};
+struct TPCSelection {
+  bool matter;
+  bool operator()(bool isMatter, float dcaxy, bool hasGoodTOFmass) const { return isMatter == matter && std::abs(dcaxy) < 0.2 && hasGoodTOFmass; }
+};
+struct TOFSelection {
+  bool matter;
+  float maxNsigma;
+  bool operator()(bool isMatter, float dcaxy, float nsigma) const { return isMatter == matter && std::abs(dcaxy) < 0.2 && std::abs(nsigma) < maxNsigma; }
+};
+
 auto defineColumnsForData(ROOT::RDataFrame& d) {
-  return d.Define("ptUncorr", "2 * std::abs(fPt)")
-          .Define("pt", "ptUncorr + 0.0343554 + 0.96161 * std::exp(-1.51286 * ptUncorr)")
-          .Define("ptHe4step1", "ptUncorr + 0.0419608 + 1.75861 * std::exp(-1.4019 * ptUncorr)")
-          .Define("ptHe4", "ptHe4step1 + 0.00385223 - 0.442353 * std::exp(-1.59049 * ptHe4step1)")
-          .Define("p", "pt * cosh(fEta)")
-          .Define("tofMass", "fBeta < 1.e-3 ? 1.e9 : fBeta >= 1. ? 0 : fTPCInnerParam * 2 * sqrt(1.f / (fBeta * fBeta) - 1.f)")
-          .Define("matter", "fPt > 0")
+  return d.Define("ptUncorr", computePtUncorr, {"fPt"})
+          .Define("pt", ptCorrHe3, {"ptUncorr"})
+          .Define("ptHe4", ptCorrHe4, {"ptUncorr"})
+          .Define("p", computeMomentum, {"pt", "fEta"})
+          .Define("tofMass", computeTOFmass, {"fBeta", "fTPCInnerParam"})
+          .Define("matter", isMatter, {"fPt"})
           .Define("pidForTracking", "fFlags >> 12")
           .Define("nsigmaHe3", nsigmaHe3, {"fTPCInnerParam", "fTPCsignal"})
           .Define("nsigmaH3", nsigmaH3, {"fTPCInnerParam", "fTPCsignal"})
           .Define("nsigmaHe4", nsigmaHe4, {"fTPCInnerParam", "fTPCsignal"})
-          .Define("nITSclsIB", "int(0) + bool(fITSclsMap & 1) + bool(fITSclsMap & 2) + bool(fITSclsMap & 4)")
-          .Define("nITScls", "nITSclsIB + bool(fITSclsMap & 8) + bool(fITSclsMap & 16) + bool(fITSclsMap & 32) + bool(fITSclsMap & 64)")
-          .Define("hasTOF", "fFlags & (1 << 5)")
-          .Define("isPrimary", "fFlags & (1 << 9)")
-          .Define("isSecondaryFromMaterial", "fFlags & (1 << 10)")
-          .Define("isSecondaryFromWeakDecay", "fFlags & (1 << 11)")
-          .Define("deltaMassHe3", "tofMass - 2.80839")
-          .Define("deltaMassHe4", "tofMass - 3.72738")
-          .Define("yHe3", "std::asinh(pt / std::hypot(pt, 2.80839) * std::sinh(fEta))")
-          .Define("yHe4", "std::asinh(pt / std::hypot(pt, 3.72738) * std::sinh(fEta))")
-          .Define("hasGoodTOFmassHe3", "!hasTOF || std::abs(deltaMassHe3) < 0.6")
-          .Define("hasGoodTOFmassHe4", "!hasTOF || std::abs(deltaMassHe4) < 0.3")
+          .Define("nITSclsIB", "countITSclsIB(fITSclsMap)")
+          .Define("nITScls", "countITScls(fITSclsMap)")
+          .Define("nTPCcls", "static_cast<int>(fTPCnCls)")
+          .Define("hasTOF", "(fFlags & kHasTOF) != 0")
+          .Define("isPrimary", "(fFlags & kIsPrimary) != 0")
+          .Define("isSecondaryFromMaterial", "(fFlags & kIsSecondaryFromMaterial) != 0")
+          .Define("isSecondaryFromWeakDecay", "(fFlags & kIsSecondaryFromWeakDecay) != 0")
+          .Define("deltaMassHe3", computeDeltaMassHe3, {"tofMass"})
+          .Define("deltaMassHe4", computeDeltaMassHe4, {"tofMass"})
+          .Define("sinhEta", fastSinh, {"fEta"})
+          .Define("yHe3", computeRapidityHe3, {"pt", "sinhEta"})
+          .Define("yHe4", computeRapidityHe4, {"pt", "sinhEta"})
+          .Define("hasGoodTOFmassHe3", passTOFmassCutHe3, {"hasTOF", "deltaMassHe3"})
+          .Define("hasGoodTOFmassHe4", passTOFmassCutHe4, {"hasTOF", "deltaMassHe4"})
           .Define("nsigmaDCAxy", nSigmaDCAxy, {"pt", "fDCAxy"})
           .Define("nsigmaDCAz", nSigmaDCAz, {"pt", "fDCAz"});
 }
 
+auto defineColumnsForMC(ROOT::RDataFrame& d) {
+  return defineColumnsForData(d)
+          .Define("gP", "fgPt * std::cosh(fgEta)")
+          .Define("gM", "std::abs(fPDGcode) == 1000020030 ? 2.809230089 : (std::abs(fPDGcode) == 1000010030 ? 2.80892 : (std::abs(fPDGcode) == 1000020040 ? 3.72738 : (std::abs(fPDGcode) == 1000010020 ? 1.87561 : 0.1)))")
+          .Define("gE", "std::hypot(gM, gP)")
+          .Define("gMt", "std::hypot(gM, fgPt)")
+          .Define("yMC", "std::asinh(fgPt / gMt * std::sinh(fgEta))")
+          .Define("deltaPtUncorrected", "ptUncorr - fgPt")
+          .Define("ptWeight", "(5.04194/1.3645054) * fgPt * std::exp(-fgPt * 1.35934)")
+          .Define("isHe3", "std::abs(fPDGcode) == 1000020030")
+          .Define("isHe4", "std::abs(fPDGcode) == 1000020040");
+}
+
+/// Writes reco / gen of one cut trial as an efficiency x acceptance histogram and returns it
+TH1* writeTrialEfficiency(TH1* reco, TH1* gen, const char* name, const char* key, Color_t color)
+{
+  auto eff = (TH1 *)reco->Clone(name);
+  eff->Divide(gen);
+  eff->SetLineColor(color);
+  eff->GetYaxis()->SetTitle("Efficiency #times Acceptance");
+  eff->Write(key);
+  return eff;
+}
+
+void writeTOFmatching(TH1* recoTOF, TH1* effTPC, const char* name)
+{
+  auto matching = (TH1 *)recoTOF->Clone(name);
+  matching->Divide(effTPC);
+  matching->Write();
+}
 
 #endif